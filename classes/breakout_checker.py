@@ -1,16 +1,19 @@
 """Breakout detection for Turtle Trading strategy."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from datetime import date
 
 from .constants import *
 from .calculator import (
+    BULLISH_MA_COLUMNS,
     calculate_n_days_high_at_index,
-    check_bullish_arrangement_at_index,
-    check_price_break_n_days_high
+    check_bullish_arrangement_at_index
 )
+from .file_handler import read_csv
+from .data_retriever import load_highs_frame
 
 
 # =============================================================================
@@ -80,8 +83,8 @@ def _get_live_ticker_data(ticker: str, today: str) -> Optional[dict]:
     df = pd.read_csv(f'{MARKET_DATA_FOLDER_PATH}/{ticker}.csv')
     last_index = len(df) - 1
     
-    atr_20 = df.iloc[last_index][ATR_20]
-    bullish = df.iloc[last_index][BULLISH_ARRANGEMENT]
+    atr_20 = df[ATR_20].iat[last_index]
+    bullish = df[BULLISH_ARRANGEMENT].iat[last_index]
     
     stock = yf.Ticker(ticker)
     current_price = stock.info.get('regularMarketPrice')
@@ -112,25 +115,26 @@ def _get_live_ticker_data(ticker: str, today: str) -> Optional[dict]:
 def _get_close_ticker_data(ticker: str, today: str) -> Optional[dict]:
     """Get ticker data from local CSV only."""
     df = pd.read_csv(f'{MARKET_DATA_FOLDER_PATH}/{ticker}.csv')
-    last_row = df.iloc[-1]
     last_index = len(df) - 1
+    last_close = df[CLOSE].iat[last_index]
+    atr_20 = df[ATR_20].iat[last_index]
     
     return {
         DATE: today,
         TICKER: ticker,
-        OPEN: round(last_row[OPEN], ROUND_DP),
-        HIGH: round(last_row[HIGH], ROUND_DP),
-        LOW: round(last_row[LOW], ROUND_DP),
-        CLOSE: round(last_row[CLOSE], ROUND_DP),
-        CURRENT_PRICE: last_row[CLOSE],
+        OPEN: round(df[OPEN].iat[last_index], ROUND_DP),
+        HIGH: round(df[HIGH].iat[last_index], ROUND_DP),
+        LOW: round(df[LOW].iat[last_index], ROUND_DP),
+        CLOSE: round(last_close, ROUND_DP),
+        CURRENT_PRICE: last_close,
         DAYS_HIGH_10: calculate_n_days_high_at_index(df, last_index, 10),
         DAYS_HIGH_20: calculate_n_days_high_at_index(df, last_index, 20),
         DAYS_HIGH_55: calculate_n_days_high_at_index(df, last_index, 55),
         DAYS_HIGH_100: calculate_n_days_high_at_index(df, last_index, 100),
         DAYS_HIGH_200: calculate_n_days_high_at_index(df, last_index, 200),
-        BULLISH_ARRANGEMENT: last_row[BULLISH_ARRANGEMENT],
-        ATR_20: last_row[ATR_20],
-        STOP_LOSS: round(last_row[CLOSE] - STOP_LOSS_ATR_MULTIPLIER * last_row[ATR_20], ROUND_DP)
+        BULLISH_ARRANGEMENT: df[BULLISH_ARRANGEMENT].iat[last_index],
+        ATR_20: atr_20,
+        STOP_LOSS: round(last_close - STOP_LOSS_ATR_MULTIPLIER * atr_20, ROUND_DP)
     }
 
 
@@ -138,11 +142,50 @@ def _get_close_ticker_data(ticker: str, today: str) -> Optional[dict]:
 # PRICE BREAKOUT DETECTION
 # =============================================================================
 
+def fetch_live_prices(tickers: List[str]) -> Dict[str, float]:
+    """
+    Fetch today's high for many tickers in one batched request.
+    
+    Args:
+        tickers: List of ticker symbols
+        
+    Returns:
+        Dict mapping ticker to today's high (tickers without a quote are omitted)
+    """
+    if not tickers:
+        return {}
+    
+    try:
+        history = yf.download(
+            tickers,
+            period=PERIOD_1D,
+            group_by='ticker',
+            threads=True,
+            progress=False,
+            auto_adjust=False
+        )
+    except Exception as e:
+        print(f"Error fetching live prices: {e}")
+        return {}
+    
+    if history.empty:
+        return {}
+    
+    if isinstance(history.columns, pd.MultiIndex):
+        highs = history.xs(HIGH, axis=1, level=1).iloc[-1]
+    else:
+        highs = pd.Series({tickers[0]: history[HIGH].iloc[-1]})
+    
+    return {ticker: float(price) for ticker, price in highs.dropna().items()}
+
+
 def check_price_breakout_for_tickers(
     tickers: List[str],
     n_days: int,
     use_live_price: bool = False,
-    env_folder_path: Optional[str] = None
+    env_folder_path: Optional[str] = None,
+    live_prices: Optional[Dict[str, float]] = None,
+    highs_frame: Optional[pd.DataFrame] = None
 ) -> List[str]:
     """
     Check which tickers have price breakouts.
@@ -152,14 +195,20 @@ def check_price_breakout_for_tickers(
         n_days: Number of days for breakout period
         use_live_price: Use live prices instead of historical
         env_folder_path: Optional environment folder path prefix
+        live_prices: Prefetched live prices from fetch_live_prices, so several
+            periods can share one download (fetched here if None)
+        highs_frame: Preloaded frame from load_highs_frame, so several periods
+            can share one read of the saved data (loaded here if None)
         
     Returns:
         List of tickers with breakouts
     """
     if use_live_price:
-        breakout_tickers = _check_breakout_with_live_price(tickers, n_days, env_folder_path)
+        if live_prices is None:
+            live_prices = fetch_live_prices(tickers)
+        breakout_tickers = _check_breakout_with_live_price(tickers, n_days, live_prices, env_folder_path, highs_frame)
     else:
-        breakout_tickers = _check_breakout_from_history(tickers, n_days, 0, env_folder_path)
+        breakout_tickers = _check_breakout_from_history(tickers, n_days, 0, env_folder_path, highs_frame)
     
     print(f"{n_days}-days high Breakout tickers: {', '.join(breakout_tickers)} (Count: {len(breakout_tickers)})")
     return breakout_tickers
@@ -168,67 +217,77 @@ def check_price_breakout_for_tickers(
 def _check_breakout_with_live_price(
     tickers: List[str],
     days: int,
-    env_folder_path: Optional[str] = None
+    live_prices: Dict[str, float],
+    env_folder_path: Optional[str] = None,
+    highs_frame: Optional[pd.DataFrame] = None
 ) -> List[str]:
-    """Check breakout using today's high price from yfinance."""
-    breakout_tickers = []
-    folder_path = f'{env_folder_path}{MARKET_DATA_FOLDER_PATH}' if env_folder_path else MARKET_DATA_FOLDER_PATH
+    """
+    Check breakout using today's high price from prefetched live prices.
     
-    for ticker in tickers:
-        try:
-            df = pd.read_csv(f'{folder_path}/{ticker}.csv')
-            stock = yf.Ticker(ticker)
-            price = stock.info.get('dayHigh', stock.info.get('regularMarketPrice'))
-            
-            if price and check_price_break_n_days_high(df, days, price):
-                breakout_tickers.append(ticker)
-        except Exception as e:
-            print(f"Error checking breakout for {ticker}: {e}")
+    The n-days highs of every ticker come from one reduction over the last
+    rows of the saved highs frame, which only changes when the market data
+    is refilled.
+    """
+    if highs_frame is None:
+        highs_frame = load_highs_frame(tickers, env_folder_path)
+    if highs_frame.empty:
+        return []
     
-    return sorted(breakout_tickers)
+    # One dense pass over every column: tickers without a quote get NaN, which never breaks out
+    n_days_highs = np.fmax.reduce(highs_frame.to_numpy()[-days:], axis=0)
+    prices = np.array(
+        [live_prices.get(ticker) or np.nan for ticker in highs_frame.columns],
+        dtype=n_days_highs.dtype
+    )
+    # Compared at the frame's precision so a price equal to the saved high is not a breakout
+    return sorted(highs_frame.columns[prices > n_days_highs].tolist())
 
 
 def _check_breakout_from_history(
     tickers: List[str],
     days: int,
     days_ago: int,
-    env_folder_path: Optional[str] = None
+    env_folder_path: Optional[str] = None,
+    highs_frame: Optional[pd.DataFrame] = None
 ) -> List[str]:
-    """Check breakout using historical data from n days ago."""
-    breakout_tickers = []
+    """
+    Check breakout using historical data from n days ago.
     
-    for ticker in tickers:
-        if _check_historical_breakout(ticker, days, days_ago, env_folder_path):
-            breakout_tickers.append(ticker)
+    The saved highs of all tickers are loaded as one wide frame and every
+    ticker is compared in a single vectorized pass.
+    """
+    if highs_frame is None:
+        highs_frame = load_highs_frame(tickers, env_folder_path)
+    highs = highs_frame.to_numpy()
+    if days_ago > 0:
+        highs = highs[:-days_ago]
     
-    return sorted(breakout_tickers)
+    if len(highs) < days + 1:
+        return []
+    
+    # History length per ticker, counted from its first saved row
+    lengths = len(highs) - np.argmax(~np.isnan(highs), axis=0)
+    eligible = lengths >= days + 1
+    if not eligible.any():
+        return []
+    
+    windows = highs[-(days + 1):, eligible]
+    mask = _breakout_mask(windows[:-1].T, windows[-1])
+    return sorted(highs_frame.columns[eligible][mask].tolist())
 
 
-def _check_historical_breakout(
-    ticker: str,
-    days: int,
-    days_ago: int,
-    env_folder_path: Optional[str] = None
-) -> bool:
-    """Check if ticker had a breakout n days ago."""
-    try:
-        folder_path = f'{env_folder_path}{MARKET_DATA_FOLDER_PATH}' if env_folder_path else MARKET_DATA_FOLDER_PATH
-        df = pd.read_csv(f'{folder_path}/{ticker}.csv')
-        
-        if days_ago > 0:
-            df = df.iloc[:-days_ago]
-        
-        if len(df) < days + 1:
-            return False
-        
-        last_index = len(df) - 1
-        n_days_high = df.iloc[last_index - days:last_index][HIGH].max()
-        previous_high = df.iloc[last_index][HIGH]
+def _breakout_mask(window_highs: np.ndarray, prices: np.ndarray) -> np.ndarray:
+    """
+    Flag rows whose price is above the highest high of their window.
+    
+    Args:
+        window_highs: (tickers x days) array of highs; missing values are ignored
+        prices: Price to compare for each ticker
         
-        return previous_high > n_days_high
-    except Exception as e:
-        print(f"Error checking historical breakout for {ticker}: {e}")
-        return False
+    Returns:
+        Boolean array, True where the price breaks out
+    """
+    return prices > np.fmax.reduce(window_highs, axis=1)
 
 
 # =============================================================================
@@ -255,7 +314,7 @@ def check_moving_average_breakout_for_tickers(
     
     for ticker in tickers:
         try:
-            df = pd.read_csv(f'{MARKET_DATA_FOLDER_PATH}/{ticker}.csv')
+            df = read_csv(f'{MARKET_DATA_FOLDER_PATH}/{ticker}.csv', [first_ma, second_ma])
             if _check_ma_crossover(df, first_ma, second_ma):
                 breakout_tickers.append(ticker)
         except Exception as e:
@@ -269,12 +328,12 @@ def _check_ma_crossover(df: pd.DataFrame, first_ma: str, second_ma: str) -> bool
     if len(df) < 3:
         return False
     
-    first_ma_vals = df[first_ma]
-    second_ma_vals = df[second_ma]
+    first_ma_vals = df[first_ma].to_numpy()
+    second_ma_vals = df[second_ma].to_numpy()
     
     # Today: first > second, Yesterday: first < second
-    return (first_ma_vals.iloc[-1] > second_ma_vals.iloc[-1] and 
-            first_ma_vals.iloc[-2] < second_ma_vals.iloc[-2])
+    return (first_ma_vals[-1] > second_ma_vals[-1] and 
+            first_ma_vals[-2] < second_ma_vals[-2])
 
 
 # =============================================================================
@@ -303,7 +362,7 @@ def check_bullish_arrangement_for_tickers(tickers: List[str]) -> List[str]:
 def check_bullish_arrangement_for_ticker(ticker: str) -> bool:
     """Check if a single ticker is in bullish arrangement."""
     try:
-        df = pd.read_csv(f'{MARKET_DATA_FOLDER_PATH}/{ticker}.csv')
+        df = read_csv(f'{MARKET_DATA_FOLDER_PATH}/{ticker}.csv', BULLISH_MA_COLUMNS)
         return check_bullish_arrangement_at_index(df, len(df) - 1)
     except Exception as e:
         print(f"Error checking bullish arrangement for {ticker}: {e}")
@@ -338,7 +397,7 @@ def filter_tickers_by_reset_signal(tickers: List[str], n_days: int) -> List[str]
     
     for ticker in tickers:
         try:
-            df = pd.read_csv(f'{MARKET_DATA_FOLDER_PATH}/{ticker}.csv')
+            df = read_csv(f'{MARKET_DATA_FOLDER_PATH}/{ticker}.csv', [HIGH, LOW])
             
             if len(df) < max(n_days, m_days) + 1:
                 continue
@@ -371,11 +430,13 @@ def _find_last_low_breakout_date(df: pd.DataFrame, m_days: int) -> Optional[int]
     Returns:
         Index of the most recent low breakout, or None if not found
     """
+    lows = df[LOW].to_numpy()
+    
     # Start from the latest date and go backwards
-    for i in range(len(df) - 1, m_days - 1, -1):
+    for i in range(len(lows) - 1, m_days - 1, -1):
         # Calculate m_days low for the period before index i
-        m_days_low = df.iloc[i - m_days:i][LOW].min()
-        current_low = df.iloc[i][LOW]
+        m_days_low = np.nanmin(lows[i - m_days:i])
+        current_low = lows[i]
         
         # Check if current low breaks below m_days low
         if current_low <= m_days_low:
@@ -395,11 +456,13 @@ def _find_last_high_breakout_date(df: pd.DataFrame, n_days: int) -> Optional[int
     Returns:
         Index of the most recent high breakout, or None if not found
     """
+    highs = df[HIGH].to_numpy()
+    
     # Start from the latest date and go backwards
-    for i in range(len(df) - 1, n_days - 1, -1):
+    for i in range(len(highs) - 1, n_days - 1, -1):
         # Calculate n_days high for the period before index i
-        n_days_high = df.iloc[i - n_days:i][HIGH].max()
-        current_high = df.iloc[i][HIGH]
+        n_days_high = np.nanmax(highs[i - n_days:i])
+        current_high = highs[i]
         
         # Check if current high breaks above n_days high
         if current_high >= n_days_high:
@@ -0,0 +1,54 @@
+"""Disk cache for DataFrames fetched over the network."""
+
+from typing import Any, Optional
+from pathlib import Path
+import hashlib
+import pickle
+import time
+from .constants import CACHE_FOLDER_PATH
+from .file_handler import atomic_open
+
+# Anchored to the project root so cron jobs and the web app share one cache
+# whatever directory they are started from
+CACHE_FOLDER = Path(__file__).resolve().parent.parent / CACHE_FOLDER_PATH
+
+
+def _cache_path(key: str) -> Path:
+    """Map a cache key to its pickle file under the cache folder."""
+    return CACHE_FOLDER / f'{hashlib.sha1(key.encode("utf-8")).hexdigest()}.pkl'
+
+
+def load(key: str, ttl: float) -> Optional[Any]:
+    """
+    Load a cached object if it was stored less than ttl seconds ago.
+
+    Args:
+        key: Cache key the object was stored under
+        ttl: Maximum age of the cache entry in seconds
+
+    Returns:
+        Cached object, or None if missing, expired or unreadable
+    """
+    path = _cache_path(key)
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error reading cache entry {key}: {e}")
+        return None
+
+
+def store(key: str, value: Any) -> None:
+    """
+    Store an object in the cache, replacing any previous entry for the key.
+
+    Args:
+        key: Cache key
+        value: Object to pickle (typically a DataFrame)
+    """
+    with atomic_open(_cache_path(key), 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
@@ -1,36 +1,118 @@
 """Technical indicator calculations for Turtle Trading strategy."""
 
-from typing import List
+from typing import Callable, List
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from .constants import *
 
 
+# =============================================================================
+# ROLLING WINDOW HELPERS
+# =============================================================================
+
+def _rolling_reduce(
+    values: np.ndarray,
+    window: int,
+    accumulate: Callable[[np.ndarray], np.ndarray],
+    reduce: Callable[..., np.ndarray]
+) -> np.ndarray:
+    """
+    Apply a trailing window reduction, growing the window over the first rows.
+    
+    Rows before the window is full use the expanding reduction so the output
+    has the same length as the input.
+    """
+    if len(values) == 0:
+        return values.astype(float)
+    
+    window = max(1, min(window, len(values)))
+    head = accumulate(values[:window - 1])
+    tail = reduce(sliding_window_view(values, window), axis=1)
+    return np.concatenate([head, tail])
+
+
+def _expanding_mean(values: np.ndarray) -> np.ndarray:
+    """
+    Cumulative mean of an array.
+    
+    Each prefix is averaged directly (not via cumsum) so values match
+    pandas' mean bit for bit; only used for short window heads.
+    """
+    return np.array([values[:i + 1].mean() for i in range(len(values))], dtype=float)
+
+
+def _rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing window maximum."""
+    return _rolling_reduce(values, window, np.maximum.accumulate, np.max)
+
+
+def _rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing window minimum."""
+    return _rolling_reduce(values, window, np.minimum.accumulate, np.min)
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing window mean."""
+    return _rolling_reduce(values, window, _expanding_mean, np.mean)
+
+
 # =============================================================================
 # TRUE RANGE CALCULATIONS
 # =============================================================================
 
 def calculate_true_range_column(df: pd.DataFrame) -> pd.DataFrame:
     """Calculate True Range for entire DataFrame."""
-    true_ranges = [calculate_true_range_at_index(df, index) for index in range(len(df))]
-    df[TRUE_RANGE] = true_ranges
+    df[TRUE_RANGE] = calculate_true_range_array(
+        df[HIGH].to_numpy(dtype=float),
+        df[LOW].to_numpy(dtype=float),
+        df[CLOSE].to_numpy(dtype=float)
+    )
     return df
 
 
+def calculate_true_range_array(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    Calculate True Range for whole price arrays.
+    
+    The first row has no previous close, so it uses H-L only.
+    """
+    true_ranges = high - low
+    if len(true_ranges) > 1:
+        previous_close = close[:-1]
+        tail = true_ranges[1:]
+        # Reuse one scratch buffer for |H-C_prev| and |L-C_prev|
+        close_diff = np.subtract(high[1:], previous_close)
+        np.maximum(tail, np.abs(close_diff, out=close_diff), out=tail)
+        np.subtract(low[1:], previous_close, out=close_diff)
+        np.maximum(tail, np.abs(close_diff, out=close_diff), out=tail)
+    return np.round(true_ranges, ROUND_DP, out=true_ranges)
+
+
 def calculate_true_range_at_index(df: pd.DataFrame, index: int) -> float:
     """
     Calculate True Range at a specific index.
     
     True Range = max(H-L, |H-C_prev|, |L-C_prev|)
     """
-    row = df.iloc[index]
-    
+    return calculate_true_range_in_arrays(
+        df[HIGH].to_numpy(), df[LOW].to_numpy(), df[CLOSE].to_numpy(), index
+    )
+
+
+def calculate_true_range_in_arrays(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    index: int
+) -> float:
+    """Calculate True Range at a specific index of price arrays."""
     if index == 0:
-        return round(row[HIGH] - row[LOW], ROUND_DP)
+        return round(highs[index] - lows[index], ROUND_DP)
     
-    previous_row = df.iloc[index - 1]
-    today_high = float(row[HIGH])
-    today_low = float(row[LOW])
-    yesterday_close = float(previous_row[CLOSE])
+    today_high = float(highs[index])
+    today_low = float(lows[index])
+    yesterday_close = float(closes[index - 1])
     
     today_range = today_high - today_low
     high_close_diff = abs(today_high - yesterday_close)
@@ -45,19 +127,28 @@ def calculate_true_range_at_index(df: pd.DataFrame, index: int) -> float:
 
 def calculate_average_true_range_column(df: pd.DataFrame, days: int) -> pd.DataFrame:
     """Calculate ATR column using exponential moving average."""
-    average_true_ranges = []
+    df[f'ATR-{days}'] = calculate_average_true_range_array(df[TRUE_RANGE].to_numpy(dtype=float), days)
+    return df
+
+
+def calculate_average_true_range_array(true_ranges: np.ndarray, days: int) -> np.ndarray:
+    """
+    Calculate ATR for a True Range array.
     
-    for i in range(len(df)):
-        if i >= days:
-            previous_atr = average_true_ranges[-1]
-            current_tr = df.iloc[i][TRUE_RANGE]
-            atr = calculate_average_true_range(previous_atr, current_tr, days)
-        else:
-            atr = round(df.iloc[:i+1][TRUE_RANGE].mean(), ROUND_DP)
-        average_true_ranges.append(atr)
+    The first `days` rows use the expanding mean; later rows apply the
+    EMA recurrence on the previous rounded ATR.
+    """
+    average_true_ranges = np.round(_expanding_mean(true_ranges[:days]), ROUND_DP)
+    if len(true_ranges) <= days:
+        return average_true_ranges
     
-    df[f'ATR-{days}'] = average_true_ranges
-    return df
+    atr_values = list(average_true_ranges)
+    previous_atr = atr_values[-1]
+    for current_tr in true_ranges[days:]:
+        previous_atr = calculate_average_true_range(previous_atr, current_tr, days)
+        atr_values.append(previous_atr)
+    
+    return np.array(atr_values)
 
 
 def calculate_average_true_range(previous_atr: float, current_tr: float, days: int) -> float:
@@ -71,26 +162,25 @@ def calculate_average_true_range(previous_atr: float, current_tr: float, days: i
 
 def calculate_moving_average_column(df: pd.DataFrame, days: int) -> pd.DataFrame:
     """Calculate simple moving average column."""
-    actual_days = min(days, len(df) - 1) if len(df) > 1 else 1
-    moving_averages = []
-    
-    for index in range(len(df)):
-        if index < actual_days:
-            closes = df.iloc[:index+1][CLOSE]
-            ma = round(closes.mean(), ROUND_DP)
-        else:
-            ma = calculate_moving_average_at_index(df, index, actual_days)
-        moving_averages.append(ma)
-    
-    df[f'MA-{days}'] = moving_averages
+    df[f'MA-{days}'] = calculate_moving_average_array(df[CLOSE].to_numpy(dtype=float), days)
     return df
 
 
+def calculate_moving_average_array(closes: np.ndarray, days: int) -> np.ndarray:
+    """Calculate simple moving average for a close price array."""
+    actual_days = min(days, len(closes) - 1) if len(closes) > 1 else 1
+    return np.round(_rolling_mean(closes, actual_days), ROUND_DP)
+
+
 def calculate_moving_average_at_index(df: pd.DataFrame, index: int, days: int) -> float:
     """Calculate simple moving average at specific index."""
-    actual_days = min(days, len(df), index + 1)
-    closes = df.iloc[index - actual_days + 1:index + 1][CLOSE]
-    return round(closes.mean(), ROUND_DP)
+    return calculate_moving_average_in_array(df[CLOSE].to_numpy(), index, days)
+
+
+def calculate_moving_average_in_array(closes: np.ndarray, index: int, days: int) -> float:
+    """Calculate simple moving average at specific index of a close price array."""
+    actual_days = min(days, len(closes), index + 1)
+    return round(closes[index - actual_days + 1:index + 1].mean(), ROUND_DP)
 
 
 # =============================================================================
@@ -99,25 +189,24 @@ def calculate_moving_average_at_index(df: pd.DataFrame, index: int, days: int) -
 
 def calculate_n_days_high_column(df: pd.DataFrame, n: int) -> pd.DataFrame:
     """Calculate n-days high column."""
-    actual_n = min(n, len(df))
-    n_days_highs = []
-    
-    for index in range(len(df)):
-        if index < actual_n:
-            high = df.iloc[:index+1][HIGH].max()
-        else:
-            high = calculate_n_days_high_at_index(df, index, actual_n)
-        n_days_highs.append(round(high, ROUND_DP))
-    
-    df[f'{n}-Days High'] = n_days_highs
+    df[f'{n}-Days High'] = calculate_n_days_high_array(df[HIGH].to_numpy(dtype=float), n)
     return df
 
 
+def calculate_n_days_high_array(highs: np.ndarray, n: int) -> np.ndarray:
+    """Calculate n-days high for a high price array."""
+    return np.round(_rolling_max(highs, n), ROUND_DP)
+
+
 def calculate_n_days_high_at_index(df: pd.DataFrame, index: int, n: int) -> float:
     """Calculate n-days high at specific index."""
-    actual_n = min(n, len(df), index + 1)
-    highs = df.iloc[index - actual_n + 1:index + 1][HIGH]
-    return round(highs.max(), ROUND_DP)
+    return calculate_n_days_high_in_array(df[HIGH].to_numpy(), index, n)
+
+
+def calculate_n_days_high_in_array(highs: np.ndarray, index: int, n: int) -> float:
+    """Calculate n-days high at specific index of a high price array."""
+    actual_n = min(n, len(highs), index + 1)
+    return round(highs[index - actual_n + 1:index + 1].max(), ROUND_DP)
 
 
 # =============================================================================
@@ -126,50 +215,53 @@ def calculate_n_days_high_at_index(df: pd.DataFrame, index: int, n: int) -> floa
 
 def calculate_n_days_low_column(df: pd.DataFrame, n: int) -> pd.DataFrame:
     """Calculate n-days low column."""
-    actual_n = min(n, len(df))
-    n_days_lows = []
-    
-    for index in range(len(df)):
-        if index < actual_n:
-            low = df.iloc[:index+1][LOW].min()
-        else:
-            low = calculate_n_days_low_at_index(df, index, actual_n)
-        n_days_lows.append(round(low, ROUND_DP))
-    
-    df[f'{n}-Days Low'] = n_days_lows
+    df[f'{n}-Days Low'] = calculate_n_days_low_array(df[LOW].to_numpy(dtype=float), n)
     return df
 
 
+def calculate_n_days_low_array(lows: np.ndarray, n: int) -> np.ndarray:
+    """Calculate n-days low for a low price array."""
+    return np.round(_rolling_min(lows, n), ROUND_DP)
+
+
 def calculate_n_days_low_at_index(df: pd.DataFrame, index: int, n: int) -> float:
     """Calculate n-days low at specific index."""
-    actual_n = min(n, len(df), index + 1)
-    lows = df.iloc[index - actual_n + 1:index + 1][LOW]
-    return round(lows.min(), ROUND_DP)
+    return calculate_n_days_low_in_array(df[LOW].to_numpy(), index, n)
+
+
+def calculate_n_days_low_in_array(lows: np.ndarray, index: int, n: int) -> float:
+    """Calculate n-days low at specific index of a low price array."""
+    actual_n = min(n, len(lows), index + 1)
+    return round(lows[index - actual_n + 1:index + 1].min(), ROUND_DP)
 
 
 # =============================================================================
 # BULLISH ARRANGEMENT CALCULATIONS
 # =============================================================================
 
+BULLISH_MA_COLUMNS = [MA_5, MA_10, MA_20, MA_30, MA_50, MA_100, MA_200]
+
+
 def calculate_bullish_arrangement_column(df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculate bullish arrangement for entire DataFrame.
     Bullish: MA-5 > MA-10 > MA-20 > MA-30 > MA-50 > MA-100 > MA-200
     """
-    bullish_arrangements = [
-        check_bullish_arrangement_at_index(df, index) for index in range(len(df))
-    ]
-    df[BULLISH_ARRANGEMENT] = bullish_arrangements
+    df[BULLISH_ARRANGEMENT] = calculate_bullish_arrangement_array(df[BULLISH_MA_COLUMNS].to_numpy(dtype=float))
     return df
 
 
+def calculate_bullish_arrangement_array(moving_averages: np.ndarray) -> np.ndarray:
+    """Calculate bullish arrangement for rows of MAs ordered as BULLISH_MA_COLUMNS."""
+    return (moving_averages[:, :-1] > moving_averages[:, 1:]).all(axis=1)
+
+
 def check_bullish_arrangement_at_index(df: pd.DataFrame, index: int) -> bool:
     """Check if moving averages are in bullish arrangement at index."""
     row = df.iloc[index]
-    ma_columns = [MA_5, MA_10, MA_20, MA_30, MA_50, MA_100, MA_200]
     
-    for i in range(len(ma_columns) - 1):
-        if row[ma_columns[i]] <= row[ma_columns[i + 1]]:
+    for i in range(len(BULLISH_MA_COLUMNS) - 1):
+        if row[BULLISH_MA_COLUMNS[i]] <= row[BULLISH_MA_COLUMNS[i + 1]]:
             return False
     return True
 
@@ -178,19 +270,6 @@ def check_bullish_arrangement_at_index(df: pd.DataFrame, index: int) -> bool:
 # BREAKOUT CALCULATIONS
 # =============================================================================
 
-def check_price_break_n_days_high(df: pd.DataFrame, days: int, price: float) -> bool:
-    """Check if price breaks n-days high."""
-    if len(df) == 0:
-        return False
-    
-    actual_days = min(days, len(df))
-    last_index = len(df) - 1
-    start_index = max(0, last_index - actual_days + 1)
-    n_days_high = df.iloc[start_index:last_index + 1][HIGH].max()
-    
-    return price > n_days_high
-
-
 def check_price_break_n_days_low(df: pd.DataFrame, days: int, price: float) -> bool:
     """Check if price breaks n-days low."""
     if len(df) == 0:
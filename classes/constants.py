@@ -68,6 +68,7 @@ BREAKOUT_55_DAYS_LOW = 'Breakout-55-Days-Low'
 
 STOP_LOSS_ATR_MULTIPLIER = 2  # Stop loss = price - (2 * ATR)
 SKIP_RECENT_ROWS = 10  # Skip last N rows when downloading data (incomplete data)
+DOWNLOAD_MAX_WORKERS = 8  # Concurrent yfinance downloads
 
 # =============================================================================
 # YFINANCE PERIOD CONSTANTS
@@ -93,12 +94,18 @@ DATA_FOLDER_PATH = 'data'
 MARKET_DATA_FOLDER_PATH = 'data/market_data'
 TICKERS_FOLDER_PATH = 'data/tickers'
 CURRENT_POSITIONS_FILE_PATH = 'data/positions.csv'
+SP500_CONSTITUENTS_FILE_PATH = 'data/sp500_constituents.json'
 SCRIPT_LOGS_FOLDER_PATH = 'script_logs'
+CACHE_FOLDER_PATH = '.cache'
+TICKER_LIST_CACHE_TTL = 24 * 60 * 60  # Seconds to reuse the merged ticker list while its files are unchanged
 
 S_AND_P_500_TICKERS_FILE_NAME = 's&p500.csv'
 QQQ_TICKERS_FILE_NAME = 'qqq.csv'
 INDEX_FILE_NAMES = [S_AND_P_500_TICKERS_FILE_NAME, QQQ_TICKERS_FILE_NAME]
 
+# Columnar snapshot of saved highs, kept next to the market data CSVs
+HIGHS_SNAPSHOT_FILE_NAME = '.highs_snapshot.pkl'
+
 # Log Files
 MARKET_CLOSE_BREAKOUT_RESULT_FILE_NAME = 'market_close_breakout_result.log'
 MARKET_OPEN_BREAKOUT_RESULT_FILE_NAME = 'market_open_breakout_result.log'
@@ -134,3 +141,6 @@ FILTER_MIN_VOLATILITY = 25  # Minimum 20-day annualized historical volatility pe
 FILTER_MIN_ATR_PCT = 1.8  # Minimum 14-day ATR as percentage of price
 FILTER_MAX_PER_SECTOR = 7  # Maximum stocks per GICS sector
 FILTER_EARNINGS_SKIP_DAYS = 5  # Skip stocks with earnings in next N days
+TRADING_DAYS_PER_YEAR = 252  # Used to annualize daily volatility
+SP500_SNAPSHOT_MAX_AGE = 7 * 24 * 60 * 60  # Seconds before the S&P 500 snapshot is refreshed
+PRICE_HISTORY_CACHE_TTL = 60 * 60  # Seconds to reuse downloaded price history
@@ -1,24 +1,50 @@
 """Market data retrieval and enrichment for Turtle Trading."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import yfinance as yf
+import numpy as np
 import pandas as pd
 import os
 from datetime import date, timedelta
 
+from . import cache
 from .constants import *
 from .calculator import *
-from .file_handler import save_csv
+from .file_handler import read_csv, read_pickle, save_csv, save_pickle
+from .helper import is_valid_ticker_symbol
 
 # Column definitions
 BASIC_COLUMNS = [DATE, OPEN, HIGH, LOW, CLOSE, VOLUME]
+PRICE_COLUMNS = [OPEN, HIGH, LOW, CLOSE]
 N_DAYS_HIGH_COLUMNS = [DAYS_HIGH_10, DAYS_HIGH_20, DAYS_HIGH_30, DAYS_HIGH_55, DAYS_HIGH_100, DAYS_HIGH_200]
 N_DAYS_LOW_COLUMNS = [DAYS_LOW_10, DAYS_LOW_20]
 MOVING_AVERAGE_COLUMNS = [MA_5, MA_10, MA_20, MA_30, MA_50, MA_100, MA_200]
 TRUE_RANGE_COLUMNS = [TRUE_RANGE, ATR_20, ATR_55]
 BULLISH_COLUMNS = [BULLISH_ARRANGEMENT]
 
-NUMERIC_COLUMNS = [OPEN, HIGH, LOW, CLOSE] + N_DAYS_HIGH_COLUMNS + N_DAYS_LOW_COLUMNS + MOVING_AVERAGE_COLUMNS + TRUE_RANGE_COLUMNS
+NUMERIC_COLUMNS = PRICE_COLUMNS + N_DAYS_HIGH_COLUMNS + N_DAYS_LOW_COLUMNS + MOVING_AVERAGE_COLUMNS + TRUE_RANGE_COLUMNS
+
+# Window size (days) of each windowed indicator column
+INDICATOR_WINDOWS = {
+    DAYS_HIGH_10: 10,
+    DAYS_HIGH_20: 20,
+    DAYS_HIGH_30: 30,
+    DAYS_HIGH_55: 55,
+    DAYS_HIGH_100: 100,
+    DAYS_HIGH_200: 200,
+    DAYS_LOW_10: 10,
+    DAYS_LOW_20: 20,
+    MA_5: 5,
+    MA_10: 10,
+    MA_20: 20,
+    MA_30: 30,
+    MA_50: 50,
+    MA_100: 100,
+    MA_200: 200,
+    ATR_20: 20,
+    ATR_55: 55,
+}
 
 
 # =============================================================================
@@ -29,6 +55,9 @@ def get_all_unique_tickers(env_folder_path: Optional[str] = None, include_index_
     """
     Get all unique tickers from CSV files in tickers folder.
     
+    The merged list is cached on disk and reused while none of the ticker
+    files has been added, removed or modified.
+    
     Args:
         env_folder_path: Optional environment folder path prefix
         include_index_files: If True, also include tickers from qqq.csv and s&p500.csv in market_data folder
@@ -38,7 +67,8 @@ def get_all_unique_tickers(env_folder_path: Optional[str] = None, include_index_
     """
     from .file_handler import read_file_names_in_path
     
-    all_tickers = []
+    # (label, path) of every ticker file to merge
+    sources = []
     
     # Load tickers from tickers folder
     folder_path = f'{env_folder_path}{TICKERS_FOLDER_PATH}' if env_folder_path else TICKERS_FOLDER_PATH
@@ -46,16 +76,7 @@ def get_all_unique_tickers(env_folder_path: Optional[str] = None, include_index_
     if not os.path.exists(folder_path):
         print(f"Folder not found: {folder_path}")
     else:
-        files = read_file_names_in_path(folder_path)
-        
-        for file in files:
-            try:
-                df = pd.read_csv(f'{folder_path}/{file}.csv')
-                tickers = df[TICKER].tolist()
-                all_tickers.extend(tickers)
-                print(f'Number of tickers in {file}: {len(tickers)}')
-            except Exception as e:
-                print(f'Error reading {file}: {e}')
+        sources.extend((file, f'{folder_path}/{file}.csv') for file in read_file_names_in_path(folder_path))
     
     # Optionally add index files
     if include_index_files:
@@ -64,23 +85,57 @@ def get_all_unique_tickers(env_folder_path: Optional[str] = None, include_index_
         
         for index_file in INDEX_FILE_NAMES:
             index_path = f'{data_folder}/{index_file}'
-            try:
-                if os.path.exists(index_path):
-                    df = pd.read_csv(index_path)
-                    tickers = df[TICKER].tolist()
-                    all_tickers.extend(tickers)
-                    print(f'Number of tickers in {index_file}: {len(tickers)}')
-                else:
-                    print(f'Index file not found: {index_path}')
-            except Exception as e:
-                print(f'Error reading {index_file}: {e}')
+            if os.path.exists(index_path):
+                sources.append((index_file, index_path))
+            else:
+                print(f'Index file not found: {index_path}')
     
-    unique_tickers = sorted(list(set(all_tickers)))
+    file_versions = []
+    for _, path in sources:
+        try:
+            file_versions.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            file_versions.append((path, None))
+    
+    cache_key = f'tickers:{folder_path}:{include_index_files}'
+    cached = cache.load(cache_key, TICKER_LIST_CACHE_TTL)
+    if cached is not None and cached['versions'] == file_versions:
+        unique_tickers = cached['tickers']
+        print(f'Total unique tickers: {len(unique_tickers)} (unchanged ticker files)')
+        return unique_tickers
+    
+    all_tickers = set()
+    for label, path in sources:
+        try:
+            tickers = _read_ticker_column(path)
+            all_tickers.update(tickers)
+            print(f'Number of tickers in {label}: {len(tickers)}')
+        except Exception as e:
+            print(f'Error reading {label}: {e}')
+    
+    unique_tickers = sorted(all_tickers)
     print(f'Total unique tickers: {len(unique_tickers)}')
     
+    try:
+        cache.store(cache_key, {'versions': file_versions, 'tickers': unique_tickers})
+    except Exception as e:
+        print(f'Error caching ticker list: {e}')
+    
     return unique_tickers
 
 
+def _read_ticker_column(file_path: str) -> List[str]:
+    """Read only the ticker column of a ticker list CSV, skipping malformed symbols."""
+    df = pd.read_csv(file_path, usecols=[TICKER], dtype={TICKER: 'string'})
+    tickers = []
+    for ticker in df[TICKER].dropna().str.strip():
+        if is_valid_ticker_symbol(ticker):
+            tickers.append(ticker)
+        else:
+            print(f"Skipping invalid ticker '{ticker}' in {file_path}")
+    return tickers
+
+
 # =============================================================================
 # DATA DOWNLOAD
 # =============================================================================
@@ -88,14 +143,50 @@ def get_all_unique_tickers(env_folder_path: Optional[str] = None, include_index_
 def download_market_data_for_tickers(
     tickers: List[str],
     duration: str,
-    env_folder_path: Optional[str] = None
+    env_folder_path: Optional[str] = None,
+    max_workers: Optional[int] = None
 ) -> None:
-    """Download market data for multiple tickers."""
-    for ticker in tickers:
+    """
+    Download market data for multiple tickers.
+    
+    All tickers are downloaded in one batched yfinance request, then each
+    ticker's indicators are calculated and saved.
+    
+    Args:
+        tickers: List of ticker symbols
+        duration: Period for historical data (e.g., '5y')
+        env_folder_path: Optional environment folder path prefix
+        max_workers: Worker processes for the indicator calculation. None
+            runs serially, which is required inside the web app: a process
+            pool would fork the server or re-import app.py in every worker.
+            Only pass this from a command line entry point.
+    """
+    raw_data = {}
+    for ticker, history in _download_histories(tickers, duration).items():
         try:
-            download_market_data_for_ticker(ticker, duration, env_folder_path)
+            raw_data[ticker] = _prepare_market_data(history)
         except Exception as e:
             print(f'Error downloading {ticker}: {e}')
+    
+    if not raw_data:
+        return
+    
+    if max_workers is None:
+        for ticker, df in raw_data.items():
+            try:
+                _save_market_data(ticker, _add_all_indicators(df), env_folder_path)
+            except Exception as e:
+                print(f'Error downloading {ticker}: {e}')
+        return
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_add_all_indicators, df): ticker for ticker, df in raw_data.items()}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                _save_market_data(ticker, future.result(), env_folder_path)
+            except Exception as e:
+                print(f'Error downloading {ticker}: {e}')
 
 
 def download_market_data_for_ticker(
@@ -111,15 +202,78 @@ def download_market_data_for_ticker(
         duration: Period for historical data (e.g., '5y')
         env_folder_path: Optional environment folder path prefix
     """
+    df = _fetch_market_data(ticker, duration)
+    if df is None:
+        return
+    
+    # Calculate all technical indicators
+    df = _add_all_indicators(df)
+    _save_market_data(ticker, df, env_folder_path)
+
+
+def _fetch_market_data(ticker: str, duration: str) -> Optional[pd.DataFrame]:
+    """Download and standardize raw OHLCV data for a ticker."""
     data = yf.Ticker(ticker)
     
     if len(data.info) <= 1:
         print(f'No data available for {ticker}')
-        return
+        return None
+    
+    return _prepare_market_data(data.history(period=duration))
+
+
+def _download_histories(tickers: List[str], duration: str) -> Dict[str, pd.DataFrame]:
+    """
+    Download raw daily history for many tickers in one batched request.
+    
+    Args:
+        tickers: List of ticker symbols
+        duration: Period for historical data (e.g., '5y')
+        
+    Returns:
+        Dict mapping ticker to its history; tickers without data are omitted
+    """
+    if not tickers:
+        return {}
+    
+    try:
+        history = yf.download(
+            tickers,
+            period=duration,
+            group_by='ticker',
+            threads=DOWNLOAD_MAX_WORKERS,
+            progress=False,
+            auto_adjust=True
+        )
+    except Exception as e:
+        print(f'Error downloading market data: {e}')
+        return {}
+    
+    histories = {}
+    for ticker in tickers:
+        if isinstance(history.columns, pd.MultiIndex):
+            if ticker not in history.columns.get_level_values(0):
+                print(f'No data available for {ticker}')
+                continue
+            df = history[ticker]
+        else:
+            df = history
+        
+        # The batch aligns all tickers on one date index; drop the padding rows
+        df = df.dropna(how='all')
+        if df.empty:
+            print(f'No data available for {ticker}')
+            continue
+        if VOLUME in df.columns and not df[VOLUME].isna().any():
+            df = df.astype({VOLUME: np.int64})
+        histories[ticker] = df
     
-    # Download and process data
-    df = data.history(period=duration)
-    df = df.reset_index()
+    return histories
+
+
+def _prepare_market_data(history: pd.DataFrame) -> pd.DataFrame:
+    """Standardize raw yfinance history into the market data layout."""
+    df = history.reset_index()
     df = df[BASIC_COLUMNS]
     df = _standardize_columns(df, ROUND_DP)
     df[DATE] = df[DATE].dt.date.astype(str)
@@ -129,29 +283,41 @@ def download_market_data_for_ticker(
     if len(df) > 0 and df[DATE].iloc[-1] == today:
         df = df.iloc[:-SKIP_RECENT_ROWS]
     
-    # Calculate all technical indicators
-    df = _add_all_indicators(df)
-    
-    # Save to file
+    return df
+
+
+def _save_market_data(ticker: str, df: pd.DataFrame, env_folder_path: Optional[str] = None) -> None:
+    """Save processed market data for a ticker."""
     folder_path = f'{env_folder_path}{MARKET_DATA_FOLDER_PATH}' if env_folder_path else MARKET_DATA_FOLDER_PATH
     save_csv(df, f'{folder_path}/', f'{ticker}.csv')
     print(f'Downloaded and processed data for {ticker}')
 
 
 def _add_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """Add all technical indicators to DataFrame."""
-    columns_to_add = (
-        N_DAYS_HIGH_COLUMNS + 
-        N_DAYS_LOW_COLUMNS + 
-        MOVING_AVERAGE_COLUMNS + 
-        TRUE_RANGE_COLUMNS + 
-        BULLISH_COLUMNS
-    )
-    
-    for column in columns_to_add:
-        df = _add_column(df, column)
+    """
+    Add all technical indicators to DataFrame.
     
-    return df
+    Price columns are extracted to NumPy arrays once and every indicator is
+    computed on them, then all columns are assigned in a single call.
+    """
+    high = _price_array(df, HIGH)
+    low = _price_array(df, LOW)
+    close = _price_array(df, CLOSE)
+    true_range = calculate_true_range_array(high, low, close)
+    
+    indicators = {}
+    for column in N_DAYS_HIGH_COLUMNS:
+        indicators[column] = calculate_n_days_high_array(high, INDICATOR_WINDOWS[column])
+    for column in N_DAYS_LOW_COLUMNS:
+        indicators[column] = calculate_n_days_low_array(low, INDICATOR_WINDOWS[column])
+    for column in MOVING_AVERAGE_COLUMNS:
+        indicators[column] = calculate_moving_average_array(close, INDICATOR_WINDOWS[column])
+    indicators[TRUE_RANGE] = true_range
+    for column in [ATR_20, ATR_55]:
+        indicators[column] = calculate_average_true_range_array(true_range, INDICATOR_WINDOWS[column])
+    
+    df = df.assign(**indicators)
+    return calculate_bullish_arrangement_column(df)
 
 
 # =============================================================================
@@ -163,10 +329,45 @@ def enrich_with_indicators_for_tickers(
     duration: str,
     env_folder_path: Optional[str] = None
 ) -> None:
-    """Enrich existing ticker files with latest data."""
+    """
+    Enrich existing ticker files with latest data.
+    
+    Latest data for every ticker that needs an update is fetched in one
+    batched yfinance request before the files are updated. Files that are
+    already current (e.g. just written by download_market_data_for_tickers)
+    are only read for their last date and are not parsed again.
+    """
+    folder_path = f'{env_folder_path}{MARKET_DATA_FOLDER_PATH}' if env_folder_path else MARKET_DATA_FOLDER_PATH
+    today = date.today()
+    yesterday = (today - timedelta(days=1)).strftime("%Y-%m-%d")
+    
+    outdated_tickers = []
+    current_tickers = set()
     for ticker in tickers:
+        file_path = f'{folder_path}/{ticker}.csv'
+        if not os.path.exists(file_path):
+            continue
         try:
-            enrich_with_indicators_for_ticker(ticker, duration, env_folder_path)
+            last_date = read_csv(file_path, [DATE])[DATE].iloc[-1]
+            if _is_data_current(last_date, today, yesterday):
+                current_tickers.add(ticker)
+            else:
+                outdated_tickers.append(ticker)
+        except Exception as e:
+            print(f'Error enriching {ticker}: {e}')
+    
+    latest_data = {}
+    for ticker, history in _download_histories(outdated_tickers, duration).items():
+        try:
+            latest_data[ticker] = _prepare_latest_data(history)
+        except Exception as e:
+            print(f'Error fetching latest data: {e}')
+    
+    for ticker in tickers:
+        if ticker in current_tickers:
+            continue
+        try:
+            enrich_with_indicators_for_ticker(ticker, duration, env_folder_path, latest_data.get(ticker))
         except Exception as e:
             print(f'Error enriching {ticker}: {e}')
 
@@ -174,7 +375,8 @@ def enrich_with_indicators_for_tickers(
 def enrich_with_indicators_for_ticker(
     ticker: str,
     duration: str,
-    env_folder_path: Optional[str] = None
+    env_folder_path: Optional[str] = None,
+    latest_df: Optional[pd.DataFrame] = None
 ) -> None:
     """
     Update existing ticker file with latest data and indicators.
@@ -183,6 +385,7 @@ def enrich_with_indicators_for_ticker(
         ticker: Ticker symbol
         duration: Period for historical data
         env_folder_path: Optional environment folder path prefix
+        latest_df: Prefetched latest data (fetched here if None)
     """
     folder_path = f'{env_folder_path}{MARKET_DATA_FOLDER_PATH}' if env_folder_path else MARKET_DATA_FOLDER_PATH
     file_path = f'{folder_path}/{ticker}.csv'
@@ -193,7 +396,7 @@ def enrich_with_indicators_for_ticker(
         return
     
     # Check if update is needed
-    df = pd.read_csv(file_path)
+    df = read_csv(file_path)
     today = date.today()
     yesterday = (today - timedelta(days=1)).strftime("%Y-%m-%d")
     last_date = df[DATE].iloc[-1]
@@ -202,16 +405,21 @@ def enrich_with_indicators_for_ticker(
         return
     
     # Fetch latest data and merge
-    latest_df = _fetch_latest_data(ticker, duration)
+    if latest_df is None:
+        latest_df = _fetch_latest_data(ticker, duration)
     if latest_df is None:
         return
     
-    # Find where to start adding new rows
-    try:
-        first_new_index = latest_df[DATE].eq(last_date).idxmax() + 1
-    except:
+    # Find where to start adding new rows (dates are sorted ascending)
+    dates = latest_df[DATE].to_numpy()
+    if len(dates) == 0 or dates[0] > last_date:
         print(f'Could not find matching date for {ticker}')
         return
+    first_new_index = int(np.searchsorted(dates, last_date, side='right'))
+    
+    # Nothing new to append, so leave the file untouched
+    if first_new_index >= len(latest_df):
+        return
     
     # Add new rows with calculated indicators
     df = _append_new_rows(df, latest_df, first_new_index)
@@ -240,22 +448,26 @@ def _fetch_latest_data(ticker: str, duration: str) -> Optional[pd.DataFrame]:
     """Fetch latest market data from yfinance."""
     try:
         data = yf.Ticker(ticker)
-        latest_df = data.history(period=duration)
-        latest_df = latest_df.reset_index()
-        latest_df = _standardize_columns(latest_df, ROUND_DP)
-        latest_df[DATE] = latest_df[DATE].dt.date.astype(str)
-        
-        # Remove today's data if present
-        today = date.today().strftime("%Y-%m-%d")
-        if len(latest_df) > 0 and latest_df[DATE].iloc[-1] == today:
-            latest_df = latest_df.iloc[:-1]
-        
-        return latest_df
+        return _prepare_latest_data(data.history(period=duration))
     except Exception as e:
         print(f'Error fetching latest data: {e}')
         return None
 
 
+def _prepare_latest_data(history: pd.DataFrame) -> pd.DataFrame:
+    """Standardize raw yfinance history used to extend an existing file."""
+    latest_df = history.reset_index()
+    latest_df = _standardize_columns(latest_df, ROUND_DP)
+    latest_df[DATE] = latest_df[DATE].dt.date.astype(str)
+    
+    # Remove today's data if present
+    today = date.today().strftime("%Y-%m-%d")
+    if len(latest_df) > 0 and latest_df[DATE].iloc[-1] == today:
+        latest_df = latest_df.iloc[:-1]
+    
+    return latest_df
+
+
 def _append_new_rows(
     df: pd.DataFrame,
     latest_df: pd.DataFrame,
@@ -264,16 +476,29 @@ def _append_new_rows(
     """Append new rows with calculated indicators to existing DataFrame."""
     columns = df.columns
     
+    # Extract the latest data as arrays once; handlers index into these
+    latest_values = {
+        column: _price_array(latest_df, column) if column in PRICE_COLUMNS else latest_df[column].to_numpy()
+        for column in BASIC_COLUMNS
+    }
+    
+    first_new_row = len(df)
     for index in range(start_index, len(latest_df)):
-        new_row = _calculate_row_values(df, latest_df, index, columns)
+        new_row = _calculate_row_values(df, latest_values, index, columns)
         df.loc[len(df)] = new_row
     
+    # Bullish arrangement depends on the row's MAs, so fill it in for the new rows at the end;
+    # saved rows keep the value computed when they were appended
+    if BULLISH_ARRANGEMENT in columns and len(df) > first_new_row:
+        moving_averages = df[BULLISH_MA_COLUMNS].iloc[first_new_row:].to_numpy(dtype=float)
+        df.loc[first_new_row:, BULLISH_ARRANGEMENT] = calculate_bullish_arrangement_array(moving_averages)
+    
     return df
 
 
 def _calculate_row_values(
     df: pd.DataFrame,
-    latest_df: pd.DataFrame,
+    latest_values: Dict[str, np.ndarray],
     index: int,
     columns: pd.Index
 ) -> dict:
@@ -281,85 +506,261 @@ def _calculate_row_values(
     new_row = {}
     
     for column in columns:
-        if column in BASIC_COLUMNS:
-            new_row[column] = latest_df.iloc[index][column]
-            
-        elif column in N_DAYS_HIGH_COLUMNS:
-            days = int(column.split('-')[0])
-            new_row[column] = calculate_n_days_high_at_index(latest_df, index, days)
-            
-        elif column in N_DAYS_LOW_COLUMNS:
-            days = int(column.split('-')[0])
-            new_row[column] = calculate_n_days_low_at_index(latest_df, index, days)
-            
-        elif column in MOVING_AVERAGE_COLUMNS:
-            days = int(column.split('-')[1])
-            new_row[column] = calculate_moving_average_at_index(latest_df, index, days)
-            
-        elif column == TRUE_RANGE:
-            new_row[column] = calculate_true_range_at_index(latest_df, index)
-            
-        elif column in [ATR_20, ATR_55]:
-            days = int(column.split('-')[1])
-            current_tr = calculate_true_range_at_index(latest_df, index)
-            previous_atr = df.iloc[-1][column]
-            new_row[column] = calculate_average_true_range(previous_atr, current_tr, days)
-            
-        elif column == BULLISH_ARRANGEMENT:
-            # Will be calculated after all MAs are available
-            new_row[column] = False
-        else:
-            new_row[column] = 0
+        handler, days = ROW_VALUE_HANDLERS.get(column, _DEFAULT_ROW_VALUE_HANDLER)
+        new_row[column] = handler(df, latest_values, index, column, days)
     
     return new_row
 
 
 # =============================================================================
-# UTILITY FUNCTIONS
+# SAVED DATA LOADING
 # =============================================================================
 
-def _standardize_columns(df: pd.DataFrame, decimal_places: int) -> pd.DataFrame:
-    """Round numeric columns to specified decimal places."""
-    for column in NUMERIC_COLUMNS:
-        if column in df.columns:
-            df[column] = df[column].round(decimal_places)
-    return df
+# Wide High frames keyed by (folder, ((ticker, file mtime), ...)); any rewritten file changes the key
+_HIGHS_FRAME_CACHE: Dict[tuple, pd.DataFrame] = {}
 
 
-def _add_column(df: pd.DataFrame, column_name: str) -> pd.DataFrame:
+def load_highs_frame(tickers: List[str], env_folder_path: Optional[str] = None) -> pd.DataFrame:
     """
-    Add a calculated column to DataFrame.
+    Load the saved High column of many tickers into one wide frame.
+    
+    Each column is aligned on the ticker's most recent row, so tail(n) gives
+    every ticker's last n saved highs; shorter histories are NaN-padded at
+    the top. Frames are cached for the process, and in a snapshot file next
+    to the CSVs, until a market data file changes.
     
     Args:
-        df: DataFrame to add column to
-        column_name: Name of column to add
+        tickers: List of ticker symbols
+        env_folder_path: Optional environment folder path prefix
         
     Returns:
-        DataFrame with new column
+        float32 DataFrame with one column per ticker that has a market data file
     """
-    if column_name in df.columns:
-        return df
+    folder_path = f'{env_folder_path}{MARKET_DATA_FOLDER_PATH}' if env_folder_path else MARKET_DATA_FOLDER_PATH
     
-    if column_name == TRUE_RANGE:
-        return calculate_true_range_column(df)
+    file_versions = []
+    for ticker in tickers:
+        try:
+            file_versions.append((ticker, os.stat(f'{folder_path}/{ticker}.csv').st_mtime_ns))
+        except OSError:
+            print(f'Market data not found for {ticker}')
     
-    if 'ATR' in column_name:
-        days = int(column_name.split('-')[1])
-        return calculate_average_true_range_column(df, days)
+    key = (folder_path, tuple(file_versions))
+    if key in _HIGHS_FRAME_CACHE:
+        return _HIGHS_FRAME_CACHE[key]
     
-    if 'MA' in column_name:
-        days = int(column_name.split('-')[1])
-        return calculate_moving_average_column(df, days)
+    highs_frame = _load_highs_snapshot(folder_path, file_versions)
+    if highs_frame is None:
+        highs_frame = _build_highs_frame(folder_path, file_versions)
+        try:
+            save_pickle({'versions': dict(file_versions), 'frame': highs_frame}, folder_path, HIGHS_SNAPSHOT_FILE_NAME)
+        except Exception as e:
+            print(f'Error saving highs snapshot: {e}')
     
-    if 'Days High' in column_name:
-        days = int(column_name.split('-')[0])
-        return calculate_n_days_high_column(df, days)
+    # Only the latest universe is kept; older keys are stale by definition
+    _HIGHS_FRAME_CACHE.clear()
+    _HIGHS_FRAME_CACHE[key] = highs_frame
+    return highs_frame
+
+
+def _build_highs_frame(folder_path: str, file_versions: List[tuple]) -> pd.DataFrame:
+    """
+    Parse the High column of each ticker's CSV into a right-aligned wide frame.
     
-    if 'Days Low' in column_name:
-        days = int(column_name.split('-')[0])
-        return calculate_n_days_low_column(df, days)
+    Highs are kept as float32: prices need far fewer significant digits than
+    float64 carries, and the narrower type halves the memory the breakout
+    reductions stream through.
+    """
+    columns = {}
+    for ticker, _ in file_versions:
+        try:
+            columns[ticker] = read_csv(f'{folder_path}/{ticker}.csv', [HIGH])[HIGH].to_numpy(dtype=np.float32)
+        except Exception as e:
+            print(f'Error reading market data for {ticker}: {e}')
+    
+    max_length = max((len(highs) for highs in columns.values()), default=0)
+    frame = np.full((max_length, len(columns)), np.nan, dtype=np.float32)
+    for position, highs in enumerate(columns.values()):
+        frame[max_length - len(highs):, position] = highs
+    
+    return pd.DataFrame(frame, columns=list(columns))
+
+
+def _load_highs_snapshot(folder_path: str, file_versions: List[tuple]) -> Optional[pd.DataFrame]:
+    """
+    Select the requested tickers from the saved highs snapshot.
     
-    if column_name == BULLISH_ARRANGEMENT:
-        return calculate_bullish_arrangement_column(df)
+    The snapshot is only used when every requested CSV is unchanged since it
+    was written, so it can never disagree with the CSVs.
+    """
+    try:
+        snapshot = read_pickle(f'{folder_path}/{HIGHS_SNAPSHOT_FILE_NAME}')
+    except Exception as e:
+        print(f'Error reading highs snapshot: {e}')
+        return None
+    
+    if snapshot is None:
+        return None
     
+    versions = snapshot['versions']
+    if any(versions.get(ticker) != modified_ns for ticker, modified_ns in file_versions):
+        return None
+    
+    saved_frame = snapshot['frame']
+    frame = saved_frame[[ticker for ticker, _ in file_versions if ticker in saved_frame.columns]]
+    
+    # Drop the padding rows that only longer, unrequested histories needed
+    has_value = frame.notna().to_numpy().any(axis=1)
+    first_row = int(has_value.argmax()) if has_value.any() else len(frame)
+    return frame.iloc[first_row:].reset_index(drop=True)
+
+
+# =============================================================================
+# ROW VALUE HANDLERS
+# =============================================================================
+
+def _basic_value_at_index(
+    df: pd.DataFrame,
+    latest_values: Dict[str, np.ndarray],
+    index: int,
+    column: str,
+    days: Optional[int]
+) -> Any:
+    """Copy a raw OHLCV value from the latest data."""
+    return latest_values[column][index]
+
+
+def _n_days_high_value_at_index(
+    df: pd.DataFrame,
+    latest_values: Dict[str, np.ndarray],
+    index: int,
+    column: str,
+    days: Optional[int]
+) -> Any:
+    """Calculate the n-days high for the new row."""
+    return calculate_n_days_high_in_array(latest_values[HIGH], index, days)
+
+
+def _n_days_low_value_at_index(
+    df: pd.DataFrame,
+    latest_values: Dict[str, np.ndarray],
+    index: int,
+    column: str,
+    days: Optional[int]
+) -> Any:
+    """Calculate the n-days low for the new row."""
+    return calculate_n_days_low_in_array(latest_values[LOW], index, days)
+
+
+def _moving_average_value_at_index(
+    df: pd.DataFrame,
+    latest_values: Dict[str, np.ndarray],
+    index: int,
+    column: str,
+    days: Optional[int]
+) -> Any:
+    """Calculate the moving average for the new row."""
+    return calculate_moving_average_in_array(latest_values[CLOSE], index, days)
+
+
+def _true_range_value_at_index(
+    df: pd.DataFrame,
+    latest_values: Dict[str, np.ndarray],
+    index: int,
+    column: str,
+    days: Optional[int]
+) -> Any:
+    """Calculate the True Range for the new row."""
+    return calculate_true_range_in_arrays(latest_values[HIGH], latest_values[LOW], latest_values[CLOSE], index)
+
+
+def _average_true_range_value_at_index(
+    df: pd.DataFrame,
+    latest_values: Dict[str, np.ndarray],
+    index: int,
+    column: str,
+    days: Optional[int]
+) -> Any:
+    """Roll the previous ATR forward with the new True Range."""
+    current_tr = calculate_true_range_in_arrays(latest_values[HIGH], latest_values[LOW], latest_values[CLOSE], index)
+    previous_atr = df[column].iat[-1]
+    return calculate_average_true_range(previous_atr, current_tr, days)
+
+
+def _bullish_value_at_index(
+    df: pd.DataFrame,
+    latest_values: Dict[str, np.ndarray],
+    index: int,
+    column: str,
+    days: Optional[int]
+) -> Any:
+    """Placeholder for bullish arrangement, filled in after all rows are appended."""
+    return False
+
+
+def _default_value_at_index(
+    df: pd.DataFrame,
+    latest_values: Dict[str, np.ndarray],
+    index: int,
+    column: str,
+    days: Optional[int]
+) -> Any:
+    """Fallback for unknown columns."""
+    return 0
+
+
+# Column -> (handler, window days), built once so the per-row loop is a dict lookup
+ROW_VALUE_HANDLERS = {
+    **{column: (_basic_value_at_index, None) for column in BASIC_COLUMNS},
+    **{column: (_n_days_high_value_at_index, INDICATOR_WINDOWS[column]) for column in N_DAYS_HIGH_COLUMNS},
+    **{column: (_n_days_low_value_at_index, INDICATOR_WINDOWS[column]) for column in N_DAYS_LOW_COLUMNS},
+    **{column: (_moving_average_value_at_index, INDICATOR_WINDOWS[column]) for column in MOVING_AVERAGE_COLUMNS},
+    TRUE_RANGE: (_true_range_value_at_index, None),
+    ATR_20: (_average_true_range_value_at_index, INDICATOR_WINDOWS[ATR_20]),
+    ATR_55: (_average_true_range_value_at_index, INDICATOR_WINDOWS[ATR_55]),
+    BULLISH_ARRANGEMENT: (_bullish_value_at_index, None),
+}
+_DEFAULT_ROW_VALUE_HANDLER = (_default_value_at_index, None)
+
+
+# =============================================================================
+# UTILITY FUNCTIONS
+# =============================================================================
+
+def _standardize_columns(df: pd.DataFrame, decimal_places: int) -> pd.DataFrame:
+    """Round numeric columns to specified decimal places and downcast them."""
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = _downcast_float(df[column].round(decimal_places), decimal_places)
+    if VOLUME in df.columns:
+        df[VOLUME] = _downcast_int(df[VOLUME])
     return df
+
+
+def _downcast_float(series: pd.Series, decimal_places: int) -> pd.Series:
+    """
+    Downcast a rounded price column to float32 when no precision is lost.
+    
+    float32 keeps ~7 significant digits, so prices above ~1000 cannot hold
+    ROUND_DP decimals exactly; those columns stay float64.
+    """
+    downcast = series.astype(np.float32)
+    restored = downcast.to_numpy(dtype=float).round(decimal_places)
+    if np.array_equal(restored, series.to_numpy(dtype=float), equal_nan=True):
+        return downcast
+    return series
+
+
+def _price_array(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Extract a price column as float64, re-rounding values stored as float32."""
+    return df[column].to_numpy(dtype=float).round(ROUND_DP)
+
+
+def _downcast_int(series: pd.Series) -> pd.Series:
+    """Downcast a volume column to int32 when every value fits."""
+    if series.isna().any() or len(series) == 0:
+        return series
+    if series.max() <= np.iinfo(np.int32).max and series.min() >= np.iinfo(np.int32).min:
+        return series.astype(np.int32)
+    return series
+
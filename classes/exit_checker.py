@@ -143,14 +143,14 @@ def _check_stop_loss_hit(ticker: str, stop_loss: float, days: int, env_folder_pa
             return False
         
         # Get the most recent (last) low from the Low column
-        last_low = df[LOW].iloc[-1]
+        last_low = df[LOW].iat[-1]
         
         # Condition 1: Last low hits stop loss level
         if last_low <= stop_loss:
             return True
         
         # Condition 2: Last low hits the n-days low
-        most_recent_n_days_low = df[days_low_col].iloc[-1]
+        most_recent_n_days_low = df[days_low_col].iat[-1]
         if last_low <= most_recent_n_days_low:
             return True
         
@@ -204,7 +204,7 @@ def _check_stop_loss_hit_live(ticker: str, stop_loss: float, days: int, env_fold
             return True
         
         # Condition 2: Current low hits the n-days low
-        most_recent_n_days_low = df[days_low_col].iloc[-1]
+        most_recent_n_days_low = df[days_low_col].iat[-1]
         if current_low <= most_recent_n_days_low:
             return True
         
@@ -1,22 +1,106 @@
-"""File I/O utilities for CSV operations."""
+"""File I/O utilities for CSV and pickle operations."""
 
-from typing import List
+from typing import IO, Any, Iterator, List, Optional
+from contextlib import contextmanager
 from pathlib import Path
+import os
+import pickle
+import tempfile
 import pandas as pd
 
+# Read once at import; os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_open(full_path: Path, mode: str = 'w', **kwargs: Any) -> Iterator[IO]:
+    """
+    Open a temporary file that replaces full_path once the block completes.
+    
+    The temporary file lives in the same directory, so the final rename is
+    atomic and a crash never leaves a half-written file. It gets the
+    permissions a plain open() would create, not mkstemp's owner-only 0600.
+    
+    Args:
+        full_path: Path of the file to replace
+        mode: File mode passed to os.fdopen ('w' or 'wb')
+        **kwargs: Extra arguments passed to os.fdopen (e.g. encoding)
+        
+    Yields:
+        Open file object for the temporary file
+    """
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    fd, temp_path = tempfile.mkstemp(dir=full_path.parent, prefix=f'.{full_path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.chmod(temp_path, 0o666 & ~_UMASK)
+        os.replace(temp_path, full_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
 
 def save_csv(df: pd.DataFrame, path: str, file_name: str) -> None:
     """
     Save DataFrame to CSV file.
     
+    The file is written to a temporary file in the same directory and then
+    renamed over the target, so a crash never leaves a half-written CSV.
+    
     Args:
         df: DataFrame to save
         path: Directory path (with trailing slash)
         file_name: Name of the file including .csv extension
     """
-    full_path = Path(path) / file_name
-    full_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(full_path, index=False, encoding='utf-8')
+    with atomic_open(Path(path) / file_name, 'w', encoding='utf-8', newline='') as f:
+        df.to_csv(f, index=False)
+
+
+def read_csv(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a CSV file through a memory map, optionally parsing only some columns.
+    
+    Args:
+        file_path: Path to the CSV file
+        columns: Column names to parse (all columns if None)
+        
+    Returns:
+        DataFrame with the requested columns
+    """
+    return pd.read_csv(file_path, usecols=columns, memory_map=True, engine='c')
+
+
+def save_pickle(obj: Any, path: str, file_name: str) -> None:
+    """
+    Save an object to a pickle file, replacing the previous file atomically.
+    
+    Args:
+        obj: Object to pickle
+        path: Directory path (with trailing slash)
+        file_name: Name of the file including extension
+    """
+    with atomic_open(Path(path) / file_name, 'wb') as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def read_pickle(file_path: str) -> Optional[Any]:
+    """
+    Read a pickle file.
+    
+    Args:
+        file_path: Path to the pickle file
+        
+    Returns:
+        Unpickled object, or None if the file does not exist
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
 
 
 def read_file_names_in_path(path: str) -> List[str]:
@@ -29,12 +113,12 @@ def read_file_names_in_path(path: str) -> List[str]:
     Returns:
         List of file names without extensions
     """
-    path_obj = Path(path)
-    if not path_obj.exists():
+    if not os.path.isdir(path):
         return []
     
-    return [
-        file.stem 
-        for file in path_obj.iterdir() 
-        if file.is_file() and not file.name.startswith('.')
-    ]
+    with os.scandir(path) as entries:
+        return [
+            os.path.splitext(entry.name)[0]
+            for entry in entries
+            if entry.is_file() and not entry.name.startswith('.')
+        ]
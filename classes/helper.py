@@ -1,13 +1,22 @@
 """Helper utilities for market operations and list manipulation."""
 
 import os
-from datetime import date, datetime, timezone
+import re
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import List, Set, TypeVar
+import pandas as pd
 import pandas_market_calendars as pmc
 
 
 T = TypeVar('T')
 
+# Built once; calendar construction is the expensive part of a schedule lookup
+_NYSE_CALENDAR = pmc.get_calendar('NYSE')
+
+# Yahoo Finance symbols: optional index caret, root, optional class/exchange suffix (BRK-B, ^GSPC)
+_TICKER_SYMBOL_PATTERN = re.compile(r'\^?[A-Z0-9]{1,6}(?:[-.=][A-Z0-9]{1,4})?')
+
 
 def get_duplicated_items_from_lists(multiple_lists: List[List[T]]) -> Set[T]:
     """
@@ -33,6 +42,21 @@ def get_duplicated_items_from_lists(multiple_lists: List[List[T]]) -> Set[T]:
     return duplicates
 
 
+def is_valid_ticker_symbol(symbol: str) -> bool:
+    """
+    Check that a symbol looks like a Yahoo Finance ticker.
+    
+    Malformed symbols would only cost a failed yfinance request each.
+    
+    Args:
+        symbol: Ticker symbol to check
+        
+    Returns:
+        True if the symbol has a valid format
+    """
+    return _TICKER_SYMBOL_PATTERN.fullmatch(symbol) is not None
+
+
 def check_if_market_is_open() -> bool:
     """
     Check if NYSE market is currently open (in HK timezone).
@@ -45,25 +69,29 @@ def check_if_market_is_open() -> bool:
     Returns:
         True if US market is currently open (comparing in HK timezone)
     """
-    from datetime import timedelta
-
     now_utc = datetime.now(timezone.utc)
+    schedule = _get_nyse_schedule_for_month(now_utc.year, now_utc.month)
 
-    nyse = pmc.get_calendar('NYSE')
-    start_date = (now_utc.date() - timedelta(days=1)).isoformat()
-    end_date = (now_utc.date() + timedelta(days=1)).isoformat()
-    schedule = nyse.schedule(start_date=start_date, end_date=end_date)
-
-    if schedule.empty:
+    # A NYSE session always falls within a single UTC calendar day
+    session_date = pd.Timestamp(now_utc.date())
+    if session_date not in schedule.index:
         return False
 
-    for _, row in schedule.iterrows():
-        market_open_utc = row['market_open'].to_pydatetime()
-        market_close_utc = row['market_close'].to_pydatetime()
-        if market_open_utc <= now_utc <= market_close_utc:
-            return True
+    session = schedule.loc[session_date]
+    return session['market_open'] <= now_utc <= session['market_close']
 
-    return False
+
+@lru_cache(maxsize=4)
+def _get_nyse_schedule_for_month(year: int, month: int) -> pd.DataFrame:
+    """
+    Get the NYSE schedule for a calendar month, indexed by session date.
+
+    Cached so long-running processes (web app, polling bot) fetch each
+    month's schedule once instead of building it on every check.
+    """
+    start_date = date(year, month, 1)
+    end_date = (start_date + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+    return _NYSE_CALENDAR.schedule(start_date=start_date.isoformat(), end_date=end_date.isoformat())
 
 
 def check_if_previous_night_market_was_open() -> bool:
@@ -77,13 +105,10 @@ def check_if_previous_night_market_was_open() -> bool:
     Returns:
         True if a NYSE closing bell occurred within the last 24 hours
     """
-    from datetime import timedelta
-
     now_utc = datetime.now(timezone.utc)
     window_start = now_utc - timedelta(hours=24)
 
-    nyse = pmc.get_calendar('NYSE')
-    schedule = nyse.schedule(
+    schedule = _NYSE_CALENDAR.schedule(
         start_date=window_start.date().isoformat(),
         end_date=now_utc.date().isoformat(),
     )
@@ -4,12 +4,16 @@ Filters S&P 500 tickers based on liquidity, price, and volatility criteria.
 """
 
 import yfinance as yf
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+import logging
 import os
-import csv
-import ssl
-import urllib.request
+import json
+import time
+from pathlib import Path
+import requests
+import lxml.html
+from requests.adapters import HTTPAdapter
 from classes.constants import (
     FILTER_MIN_PRICE,
     FILTER_MIN_VOLUME,
@@ -17,83 +21,217 @@ from classes.constants import (
     FILTER_MIN_VOLATILITY,
     FILTER_MIN_ATR_PCT,
     FILTER_MAX_PER_SECTOR,
+    SP500_SNAPSHOT_MAX_AGE,
+    SP500_CONSTITUENTS_FILE_PATH,
+    PRICE_HISTORY_CACHE_TTL,
+    TRADING_DAYS_PER_YEAR,
     TICKERS_FOLDER_PATH
 )
+from classes import cache
+from classes.file_handler import atomic_open
+from classes.helper import is_valid_ticker_symbol
 
-# Fix SSL certificate issue on macOS
-ssl._create_default_https_context = ssl._create_unverified_context
+logger = logging.getLogger(__name__)
 
-def get_sp500_tickers():
+ANNUALIZATION_FACTOR = TRADING_DAYS_PER_YEAR ** 0.5
+
+SP500_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), SP500_CONSTITUENTS_FILE_PATH)
+
+def create_http_session():
+    """
+    Create a pooled HTTP session with a browser user-agent.
+    Returns: requests.Session
+    """
+    session = requests.Session()
+    # Add a proper user-agent header to avoid 403 Forbidden
+    session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'})
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+    session.mount('https://', adapter)
+    return session
+
+# Shared by every fetch in this module so connections are kept alive across runs
+_SESSION = create_http_session()
+
+def load_sp500_snapshot(max_age=None):
+    """
+    Load the saved S&P 500 ticker -> sector snapshot.
+    max_age: maximum snapshot age in seconds (any age if None)
+    Returns: dict mapping ticker to sector, or None if missing or too old
+    """
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(SP500_SNAPSHOT_PATH) > max_age:
+            return None
+        with open(SP500_SNAPSHOT_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error("Error reading S&P 500 snapshot: %s", e)
+        return None
+
+def save_sp500_snapshot(ticker_sector_map):
+    """
+    Save the S&P 500 ticker -> sector map as a JSON snapshot.
+    The file is replaced atomically so an overlapping run never reads a partial snapshot.
+    """
+    with atomic_open(Path(SP500_SNAPSHOT_PATH), 'w', encoding='utf-8') as f:
+        json.dump(ticker_sector_map, f, indent=2, sort_keys=True)
+
+def get_sp500_tickers(session=None):
     """
     Get list of S&P 500 tickers and their sectors.
+    Composition changes rarely, so Wikipedia is only scraped when the saved
+    snapshot is older than a week.
+    session: requests.Session used for the Wikipedia request (shared session if None)
     Returns: dict mapping ticker to sector
     """
-    # Get S&P 500 tickers from Wikipedia
-    url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
+    ticker_sector_map = load_sp500_snapshot(SP500_SNAPSHOT_MAX_AGE)
+    if ticker_sector_map:
+        return ticker_sector_map
     
-    # Add a proper user-agent header to avoid 403 Forbidden
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-    req = urllib.request.Request(url, headers=headers)
+    try:
+        ticker_sector_map = fetch_sp500_tickers(session or _SESSION)
+    except Exception as e:
+        # Fall back to a stale snapshot rather than failing the whole run
+        ticker_sector_map = load_sp500_snapshot()
+        if not ticker_sector_map:
+            raise
+        logger.warning("Using saved S&P 500 snapshot, Wikipedia fetch failed: %s", e)
+        return ticker_sector_map
     
-    with urllib.request.urlopen(req) as response:
-        tables = pd.read_html(response)
+    save_sp500_snapshot(ticker_sector_map)
+    
+    return ticker_sector_map
+
+def fetch_sp500_tickers(session):
+    """
+    Scrape S&P 500 tickers and their sectors from Wikipedia.
+    session: requests.Session used for the Wikipedia request
+    Returns: dict mapping ticker to sector
+    Raises: ValueError if the page has no constituents
+    """
+    url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
     
-    sp500_table = tables[0]
+    response = session.get(url, timeout=30)
+    response.raise_for_status()
     
+    # Parse only the constituents table rather than every table on the page
+    tree = lxml.html.fromstring(response.content)
     ticker_sector_map = {}
-    for _, row in sp500_table.iterrows():
-        ticker = row['Symbol'].replace('.', '-')  # yfinance format
-        sector = row['GICS Sector']
+    for row in tree.xpath('//table[@id="constituents"]//tr'):
+        symbol = row.xpath('string(td[1])').strip()
+        if not symbol:
+            continue  # Header row only has <th> cells
+        ticker = symbol.replace('.', '-')  # yfinance format
+        if not is_valid_ticker_symbol(ticker):
+            logger.warning("Skipping invalid ticker symbol: %s", symbol)
+            continue
+        sector = row.xpath('string(td[3])').strip()
         ticker_sector_map[ticker] = sector
     
+    # A page that parses to nothing (e.g. changed markup) must not pass as an empty index
+    if not ticker_sector_map:
+        raise ValueError("No S&P 500 constituents found on the Wikipedia page")
+    
     return ticker_sector_map
 
-def calculate_ticker_metrics(ticker):
+def download_price_history(tickers, period='60d'):
     """
-    Calculate liquidity, price, and volatility metrics for a ticker.
-    Returns: dict with metrics or None if data unavailable
+    Download daily price history for many tickers in one batched request.
+    Returns: DataFrame with (ticker, field) MultiIndex columns
     """
-    try:
-        stock = yf.Ticker(ticker)
-        
-        # Get 60 days of data for calculations
-        hist = stock.history(period='60d')
-        
-        if hist.empty or len(hist) < 30:
-            return None
-        
-        # Current price
-        current_price = hist['Close'].iloc[-1]
-        
-        # 30-day average volume
-        avg_volume_30d = hist['Volume'].tail(30).mean()
-        
-        # 30-day average dollar volume
-        avg_dollar_volume_30d = (hist['Close'] * hist['Volume']).tail(30).mean()
-        
-        # Calculate ATR (14-day)
-        high_low = hist['High'] - hist['Low']
-        high_close = abs(hist['High'] - hist['Close'].shift())
-        low_close = abs(hist['Low'] - hist['Close'].shift())
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr_14 = true_range.tail(14).mean()
-        atr_pct = (atr_14 / current_price) * 100
-        
-        # Calculate 20-day annualized volatility
-        returns = hist['Close'].pct_change().dropna()
-        volatility_20d = returns.tail(20).std() * (252 ** 0.5) * 100  # Annualized %
-        
-        return {
-            'ticker': ticker,
-            'price': current_price,
-            'avg_volume_30d': avg_volume_30d,
-            'avg_dollar_volume_30d': avg_dollar_volume_30d,
-            'atr_pct': atr_pct,
-            'volatility_20d': volatility_20d
-        }
-    except Exception as e:
-        print(f"Error processing {ticker}: {e}")
-        return None
+    key = f"hist:{','.join(sorted(tickers))}:{period}"
+    history = cache.load(key, PRICE_HISTORY_CACHE_TTL)
+    if history is None:
+        history = yf.download(
+            tickers,
+            period=period,
+            group_by='ticker',
+            threads=True,
+            progress=False,
+            auto_adjust=True
+        )
+        if not history.empty:
+            # A cache failure should not throw away a successful download
+            try:
+                cache.store(key, history)
+            except Exception as e:
+                logger.error("Error caching price history: %s", e)
+    return history
+
+def calculate_metrics_for_tickers(history):
+    """
+    Calculate liquidity, price, and volatility metrics for all tickers at once.
+    Tickers failing the price or liquidity criteria are dropped before the
+    volatility metrics are computed.
+    history: batch download with (ticker, field) MultiIndex columns
+    Returns: dict mapping ticker to metrics dict
+    """
+    # A day counts for a ticker only if all its fields are present, as with history[ticker].dropna()
+    valid = history.notna().T.groupby(level=0, sort=False).all().T
+    
+    # Need at least 30 days of data
+    has_history = valid.sum() >= 30
+    tickers = has_history[has_history].index
+    if tickers.empty:
+        return {}
+    
+    # Work on plain (days x tickers) arrays. Each ticker's valid days are moved to the
+    # bottom in order, so every window below is a slice of that ticker's own last rows
+    valid = valid[tickers].to_numpy()
+    order = np.argsort(valid, axis=0, kind='stable')
+    h, l, v, c = (
+        np.take_along_axis(
+            np.where(valid, history.xs(field, axis=1, level=1)[tickers].to_numpy(dtype=np.float64), np.nan),
+            order,
+            axis=0
+        )
+        for field in ('High', 'Low', 'Volume', 'Close')
+    )
+    
+    # Current price (last valid close)
+    current_price = c[-1]
+    
+    # 30-day average volume and dollar volume
+    avg_volume_30d = v[-30:].mean(axis=0)
+    avg_dollar_volume_30d = (c[-30:] * v[-30:]).mean(axis=0)
+    
+    # Price and liquidity are cheap; only tickers passing them get volatility metrics
+    passes = (current_price >= FILTER_MIN_PRICE) & (
+        (avg_volume_30d >= FILTER_MIN_VOLUME) | (avg_dollar_volume_30d >= FILTER_MIN_DOLLAR_VOLUME)
+    )
+    tickers = tickers[passes]
+    h, l, c = h[:, passes], l[:, passes], c[:, passes]
+    current_price = current_price[passes]
+    avg_volume_30d = avg_volume_30d[passes]
+    avg_dollar_volume_30d = avg_dollar_volume_30d[passes]
+    
+    # Calculate ATR (14-day); only the last 14 true ranges are needed
+    h14, l14, prev_close = h[-14:], l[-14:], c[-15:-1]
+    true_range = h14 - l14
+    close_diff = np.subtract(h14, prev_close)
+    np.fmax(true_range, np.abs(close_diff, out=close_diff), out=true_range)
+    np.subtract(l14, prev_close, out=close_diff)
+    np.fmax(true_range, np.abs(close_diff, out=close_diff), out=true_range)
+    atr_14 = true_range.mean(axis=0)
+    atr_pct = (atr_14 / current_price) * 100
+    
+    # Calculate 20-day annualized volatility from the last 21 closes
+    log_returns = np.diff(np.log(c[-21:]), axis=0)
+    volatility_20d = log_returns.std(axis=0, ddof=1) * ANNUALIZATION_FACTOR * 100  # Annualized %
+    
+    metrics = pd.DataFrame({
+        'price': current_price,
+        'avg_volume_30d': avg_volume_30d,
+        'avg_dollar_volume_30d': avg_dollar_volume_30d,
+        'atr_pct': atr_pct,
+        'volatility_20d': volatility_20d
+    }, index=tickers).dropna()
+    
+    return {
+        ticker: {'ticker': ticker, **values}
+        for ticker, values in metrics.to_dict('index').items()
+    }
 
 def filter_ticker(metrics):
     """
@@ -133,62 +271,62 @@ def filter_and_save_tickers(output_dir, max_per_sector=None):
     if max_per_sector is None:
         max_per_sector = FILTER_MAX_PER_SECTOR
     
-    print(f"[{datetime.now()}] Starting ticker filtering process...")
+    logger.info("Starting ticker filtering process...")
     
     # Get S&P 500 tickers
-    print(f"[{datetime.now()}] Fetching S&P 500 tickers...")
+    logger.info("Fetching S&P 500 tickers...")
     ticker_sector_map = get_sp500_tickers()
-    print(f"[{datetime.now()}] Found {len(ticker_sector_map)} tickers")
+    symbols = list(ticker_sector_map)
+    logger.info("Found %d tickers", len(symbols))
+    
+    # Download 60 days of history for all tickers at once
+    logger.info("Downloading price history...")
+    history = download_price_history(symbols)
     
     # Calculate metrics for all tickers
-    print(f"[{datetime.now()}] Calculating metrics for all tickers...")
+    logger.info("Calculating metrics for all tickers...")
     ticker_metrics = {}
-    for i, ticker in enumerate(ticker_sector_map.keys(), 1):
-        if i % 50 == 0:
-            print(f"[{datetime.now()}] Processed {i}/{len(ticker_sector_map)} tickers...")
-        metrics = calculate_ticker_metrics(ticker)
-        if metrics and filter_ticker(metrics):
-            metrics['sector'] = ticker_sector_map[ticker]
+    for ticker, metrics in calculate_metrics_for_tickers(history).items():
+        sector = ticker_sector_map.get(ticker)
+        if sector is not None and filter_ticker(metrics):
+            metrics['sector'] = sector
             metrics['score'] = calculate_score(metrics)
             ticker_metrics[ticker] = metrics
     
-    print(f"[{datetime.now()}] {len(ticker_metrics)} tickers passed filtering criteria")
+    logger.info("%d tickers passed filtering criteria", len(ticker_metrics))
     
-    # Group by sector and rank
-    sector_tickers = {}
-    for ticker, metrics in ticker_metrics.items():
-        sector = metrics['sector']
-        if sector not in sector_tickers:
-            sector_tickers[sector] = []
-        sector_tickers[sector].append((ticker, metrics['score']))
+    # Top N per sector by score, then alphabetical within each sector
+    ranked = pd.DataFrame.from_dict(ticker_metrics, orient='index', columns=['ticker', 'sector', 'score'])
+    top = (
+        ranked.sort_values('score', ascending=False, kind='stable')
+        .groupby('sector', sort=False)
+        .head(max_per_sector)
+        .sort_values('ticker')
+    )
     
-    # Select top tickers per sector and save to CSV
+    # Output file name for each sector
+    sector_filenames = {
+        sector: sector.lower().replace(' ', '_').replace('&', 'and') + '.csv'
+        for sector in set(ticker_sector_map.values())
+    }
+    
+    # Save each sector's tickers to CSV
     os.makedirs(output_dir, exist_ok=True)
     
-    for sector, tickers_scores in sector_tickers.items():
-        # Sort by score (descending) and take top N
-        tickers_scores.sort(key=lambda x: x[1], reverse=True)
-        top_tickers = [ticker for ticker, _ in tickers_scores[:max_per_sector]]
-        
-        # Sort alphabetically before saving
-        top_tickers.sort()
-        
-        # Save to CSV
-        sector_filename = sector.lower().replace(' ', '_').replace('&', 'and') + '.csv'
+    for sector, group in top.groupby('sector', sort=False):
+        top_tickers = group['ticker'].tolist()
+        sector_filename = sector_filenames[sector]
         file_path = os.path.join(output_dir, sector_filename)
         
-        with open(file_path, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=['Ticker'])
-            writer.writeheader()
-            for ticker in top_tickers:
-                writer.writerow({'Ticker': ticker})
+        Path(file_path).write_text('\n'.join(['Ticker', *top_tickers]) + '\n')
         
-        print(f"[{datetime.now()}] Saved {len(top_tickers)} tickers to {sector_filename}")
+        logger.info("Saved %d tickers to %s", len(top_tickers), sector_filename)
     
-    print(f"[{datetime.now()}] Ticker filtering complete!")
+    logger.info("Ticker filtering complete!")
     return len(ticker_metrics)
 
 if __name__ == "__main__":
     # For testing
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(message)s')
     output_dir = f'../data/{TICKERS_FOLDER_PATH}'
     filter_and_save_tickers(output_dir)
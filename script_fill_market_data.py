@@ -1,19 +1,35 @@
 import os
+import sys
 from datetime import datetime
 
-from classes.data_retriever import *
-from classes.constants import *
+from classes.data_retriever import (
+    get_all_unique_tickers,
+    download_market_data_for_tickers,
+    enrich_with_indicators_for_tickers,
+    load_highs_frame
+)
+from classes.constants import SCRIPT_LOGS_FOLDER_PATH, MAIN_LOG_FILL_MARKET_DATA_FILE_NAME, PERIOD_5Y
 
 current_script_directory = os.path.dirname(os.path.abspath(__file__)) + '/'
 
-with open(current_script_directory + SCRIPT_LOGS_FOLDER_PATH + '/' + MAIN_LOG_FILL_MARKET_DATA_FILE_NAME, 'a') as f:
-    f.write(f'[START] {str(datetime.now())} Fill market data job started\n')
+# The web app execs this script in its own process, where a process pool must not be started
+run_from_command_line = os.path.abspath(sys.argv[0]) == os.path.abspath(__file__)
 
-    tickers = get_all_unique_tickers(current_script_directory, include_index_files=True)
-    download_market_data_for_tickers(tickers, PERIOD_5Y, current_script_directory)
-    enrich_with_indicators_for_tickers(tickers, PERIOD_5Y, current_script_directory)
+# Guarded so process pool workers that re-import this module do not rerun the job
+if __name__ == '__main__':
+    with open(current_script_directory + SCRIPT_LOGS_FOLDER_PATH + '/' + MAIN_LOG_FILL_MARKET_DATA_FILE_NAME, 'a') as f:
+        f.write(f'[START] {str(datetime.now())} Fill market data job started\n')
 
-    current_time = datetime.now()
-    f.write(f'[END  ] {str(datetime.now())} Fill market data job ended ({len(tickers)} tickers filled)\n')
+        tickers = get_all_unique_tickers(current_script_directory, include_index_files=True)
+        download_market_data_for_tickers(
+            tickers,
+            PERIOD_5Y,
+            current_script_directory,
+            max_workers=os.cpu_count() if run_from_command_line else None
+        )
+        enrich_with_indicators_for_tickers(tickers, PERIOD_5Y, current_script_directory)
+        # Write the highs snapshot now so the signal jobs skip parsing the CSVs
+        load_highs_frame(tickers, current_script_directory)
 
-    
\ No newline at end of file
+        current_time = datetime.now()
+        f.write(f'[END  ] {current_time} Fill market data job ended ({len(tickers)} tickers filled)\n')
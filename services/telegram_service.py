@@ -27,6 +27,9 @@ _LOG_DIR = os.path.join(_PROJECT_ROOT, 'script_logs')
 
 TELEGRAM_API = 'https://api.telegram.org/bot{token}/{method}'
 
+# One keep-alive session for every Bot API call made by this process
+_SESSION = requests.Session()
+
 
 # ---------------------------------------------------------------------------
 # Credential helpers
@@ -77,7 +80,7 @@ def send_message(text: str, parse_mode: str = 'HTML') -> bool:
         'disable_web_page_preview': True,
     }
     try:
-        resp = requests.post(url, json=payload, timeout=10)
+        resp = _SESSION.post(url, json=payload, timeout=10)
         if resp.ok:
             logger.info('Telegram message sent successfully')
             return True
@@ -303,6 +306,56 @@ def save_alert(alert_type: str, tickers: list, period_days: int | None = None,
             logger.error(f'Failed to save alert to DB: {e2}')
 
 
+# ---------------------------------------------------------------------------
+# Signal job alerts (used by the market signal scripts)
+# ---------------------------------------------------------------------------
+
+_BREAKOUT_RESULT_RE = re.compile(r'\[.*?\] (.*?) [Bb]reakout tickers: ?(.*) \([Cc]ount: \d+\)')
+_EXIT_RESULT_RE = re.compile(r'\[.*?\] (.*?-days low) Exit tickers: ?(.*) \([Cc]ount: \d+\)')
+
+
+def _parse_today_groups(path: str, pattern: re.Pattern) -> list:
+    """Collect today's {'label': ..., 'tickers': [...]} groups from a result log."""
+    today_prefix = f'[{date.today()}]'
+    groups = []
+    if not os.path.exists(path):
+        return groups
+
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith(today_prefix):
+                continue
+            m = pattern.match(line)
+            if m:
+                tickers = [t.strip() for t in m.group(2).split(',') if t.strip()]
+                groups.append({'label': m.group(1), 'tickers': tickers})
+    return groups
+
+
+def send_signal_alerts(breakout_result_path: str, exit_result_path: str, is_live: bool) -> None:
+    """
+    Send today's breakout and exit results as Telegram alerts.
+    Each alert is only sent (and saved) when its formatter returns text.
+    """
+    today = str(date.today())
+    suffix = 'live' if is_live else 'close'
+
+    breakout_groups = _parse_today_groups(breakout_result_path, _BREAKOUT_RESULT_RE)
+    enrich_groups(breakout_groups, is_live=is_live)
+    breakout_text = format_breakout_alert(today, breakout_groups, is_live=is_live)
+    if breakout_text:
+        sent = send_message(breakout_text)
+        save_alert(f'breakout_{suffix}', [t for g in breakout_groups for t in g['tickers']], telegram_sent=sent)
+
+    exit_groups = _parse_today_groups(exit_result_path, _EXIT_RESULT_RE)
+    enrich_groups(exit_groups, is_live=is_live)
+    exit_text = format_exit_alert(today, exit_groups, is_live=is_live)
+    if exit_text:
+        sent = send_message(exit_text)
+        save_alert(f'exit_{suffix}', [t for g in exit_groups for t in g['tickers']], telegram_sent=sent)
+
+
 # ---------------------------------------------------------------------------
 # Latest-signal helpers (used by the bot)
 # ---------------------------------------------------------------------------